@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 import os
+import sys
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -89,6 +90,16 @@ DATABASES = {
     }
 }
 
+# Run the test suite against an in-memory SQLite database so tests do
+# not need (or pay the create/drop cost of) the PostgreSQL container.
+TESTING = 'test' in sys.argv or 'pytest' in sys.modules
+
+if TESTING:
+    DATABASES['default'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -0,0 +1,26 @@
+"""
+Per-user list cache keys and invalidation helpers.
+
+The cache backend is whatever settings.CACHES points at (local memory
+by default, Redis in a deployment that configures it).
+"""
+from django.core.cache import cache
+
+LIST_CACHE_TIMEOUT = 3600
+
+
+def attr_list_cache_key(
+    model_name: str,
+    user_id: int,
+    assigned_only: bool
+) -> str:
+    """Build the cache key for a user's tag/ingredient list payload."""
+    return f'{model_name}-list:{user_id}:{int(assigned_only)}'
+
+
+def invalidate_attr_list_cache(model_name: str, user_id: int) -> None:
+    """Drop both filter variants of a user's cached list payload."""
+    cache.delete_many([
+        attr_list_cache_key(model_name, user_id, False),
+        attr_list_cache_key(model_name, user_id, True),
+    ])
@@ -0,0 +1,19 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_recipe_image'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql='CREATE UNIQUE INDEX core_tag_user_lower_name_uniq ON core_tag (user_id, LOWER(name));',
+            reverse_sql='DROP INDEX core_tag_user_lower_name_uniq;',
+        ),
+        migrations.RunSQL(
+            sql='CREATE UNIQUE INDEX core_ingredient_user_lower_name_uniq ON core_ingredient (user_id, LOWER(name));',
+            reverse_sql='DROP INDEX core_ingredient_user_lower_name_uniq;',
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 3.2.25 on 2026-08-29 19:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_auto_20260829_1957'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ingredient',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='tag',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        # SQLite implements AddField as a table rebuild, which drops the
+        # raw-SQL unique indexes from 0006; recreate them (no-op elsewhere).
+        migrations.RunSQL(
+            sql='CREATE UNIQUE INDEX IF NOT EXISTS core_tag_user_lower_name_uniq ON core_tag (user_id, LOWER(name));',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.RunSQL(
+            sql='CREATE UNIQUE INDEX IF NOT EXISTS core_ingredient_user_lower_name_uniq ON core_ingredient (user_id, LOWER(name));',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -73,6 +73,16 @@ class Recipe(models.Model):
     tags = models.ManyToManyField('Tag')
     ingredients = models.ManyToManyField('Ingredient')
     image = models.ImageField(null=True, upload_to=recipe_image_file_path)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # list endpoint filters on user and orders by newest first
+            models.Index(
+                fields=['user', '-id'],
+                name='core_recipe_user_id_idx'
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.title
@@ -85,6 +95,16 @@ class Tag(models.Model):
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
     )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # list endpoint filters on user and orders by name descending
+            models.Index(
+                fields=['user', '-name'],
+                name='core_tag_user_name_idx'
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.name
@@ -97,6 +117,16 @@ class Ingredient(models.Model):
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
     )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # list endpoint filters on user and orders by name descending
+            models.Index(
+                fields=['user', '-name'],
+                name='core_ingredient_user_name_idx'
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.name
@@ -0,0 +1,34 @@
+"""
+Signal receivers that keep the per-user list caches fresh.
+"""
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from core.cache import invalidate_attr_list_cache
+from core.models import Ingredient, Recipe, Tag
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def _tag_changed(sender, instance: Tag, **kwargs) -> None:
+    """Invalidate the owner's tag list when a tag changes."""
+    invalidate_attr_list_cache('tag', instance.user_id)
+
+
+@receiver(post_save, sender=Ingredient)
+@receiver(post_delete, sender=Ingredient)
+def _ingredient_changed(sender, instance: Ingredient, **kwargs) -> None:
+    """Invalidate the owner's ingredient list when an ingredient changes."""
+    invalidate_attr_list_cache('ingredient', instance.user_id)
+
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+def _recipe_tags_changed(sender, instance: Recipe, **kwargs) -> None:
+    """Invalidate the tag list; assignments feed the assigned_only filter."""
+    invalidate_attr_list_cache('tag', instance.user_id)
+
+
+@receiver(m2m_changed, sender=Recipe.ingredients.through)
+def _recipe_ingredients_changed(sender, instance: Recipe, **kwargs) -> None:
+    """Invalidate the ingredient list; assignments feed assigned_only."""
+    invalidate_attr_list_cache('ingredient', instance.user_id)
@@ -11,22 +11,28 @@ class AdminSiteTests(TestCase):
     Tests for Django admin.
     """
 
-    def setUp(self: 'AdminSiteTests') -> None:
+    @classmethod
+    def setUpTestData(cls) -> None:
         """"
-        Crete user and client.
+        Create the users once for the whole class.
         """
-        self.client = Client()
-        self.admin_user = get_user_model().objects.create_superuser(
+        cls.admin_user = get_user_model().objects.create_superuser(
             email="admin@example.com",
             password="test123",
         )
-        self.client.force_login(self.admin_user)
-        self.user = get_user_model().objects.create_user(
+        cls.user = get_user_model().objects.create_user(
             email="user@example.com",
             password="test123",
             name="Test user",
         )
 
+    def setUp(self: 'AdminSiteTests') -> None:
+        """"
+        Create the client.
+        """
+        self.client = Client()
+        self.client.force_login(self.admin_user)
+
     def test_users_listed(self: 'AdminSiteTests') -> None:
         """
         Test that users are listed on user page.
@@ -0,0 +1,16 @@
+"""
+Pagination for Recipe APIs.
+"""
+from rest_framework.pagination import CursorPagination
+
+
+class RecipeCursorPagination(CursorPagination):
+    """Keyset pagination over the recipe primary key, newest first."""
+    ordering = '-id'
+    page_size = 20
+
+
+class RecipeAttrCursorPagination(CursorPagination):
+    """Keyset pagination for tag/ingredient lists, name descending."""
+    ordering = '-name'
+    page_size = 25
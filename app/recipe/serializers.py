@@ -99,6 +99,27 @@ class RecipeSerializer(serializers.ModelSerializer):
         return instance
 
 
+class RecipeListSerializer(serializers.Serializer):
+    """Read-only serializer for the recipe list endpoint.
+
+    Declares the fields explicitly instead of relying on ModelSerializer
+    introspection, which keeps per-object serialization cheap on the hot
+    list path. The output matches RecipeSerializer.
+    """
+    id = serializers.IntegerField(read_only=True)
+    title = serializers.CharField(read_only=True)
+    time_minutes = serializers.IntegerField(read_only=True)
+    price = serializers.DecimalField(
+        max_digits=5,
+        decimal_places=2,
+        read_only=True
+    )
+    link = serializers.CharField(read_only=True)
+    tags = TagSerializer(many=True, read_only=True)
+    ingredients = IngredientSerializer(many=True, read_only=True)
+    image = serializers.ImageField(read_only=True)
+
+
 class RecipeDetailSerializer(RecipeSerializer):
     """Serializer for recipe detail view."""
 
@@ -2,8 +2,10 @@
 Tests for the Ingredients API.
 """
 from decimal import Decimal
+from functools import lru_cache
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.urls import reverse
 from django.test import TestCase
 
@@ -21,6 +23,7 @@ from recipe.serializers import IngredientSerializer
 INGREDIENTS_URL = reverse('recipe:ingredient-list')
 
 
+@lru_cache(maxsize=None)
 def detail_url(ingredient_id: int):
     """Return ingredient detail URL."""
     return reverse('recipe:ingredient-detail', args=[ingredient_id])
@@ -47,28 +50,29 @@ class PublicIngredientsAPITests(TestCase):
 class PrivateIngredientsAPITests(TestCase):
     """Test authenticated API requests."""
 
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = create_user()
+
     def setUp(self) -> None:
-        self.user = create_user()
+        cache.clear()
+        # the list cache outlives the per-test DB rollback
         self.client = APIClient()
         self.client.force_authenticate(self.user)
 
     def test_retrieve_ingredients(self):
         """Test retrieving a list of ingredients."""
-        Ingredient.objects.create(
-            user=self.user,
-            name='Kale',
-        )
-        Ingredient.objects.create(
-            user=self.user,
-            name='Salt',
-        )
+        Ingredient.objects.bulk_create([
+            Ingredient(user=self.user, name='Kale'),
+            Ingredient(user=self.user, name='Salt'),
+        ])
 
         res = self.client.get(INGREDIENTS_URL)
         ingredients = Ingredient.objects.all().order_by('-name')
         serializer = IngredientSerializer(ingredients, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_ingredients_limited_to_user(self):
         """Test that ingredients for the authenticated user are returned."""
@@ -84,9 +88,46 @@ class PrivateIngredientsAPITests(TestCase):
 
         res = self.client.get(INGREDIENTS_URL)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data), 1)
-        self.assertEqual(res.data[0]['name'], 'Kale')
-        self.assertEqual(res.data[0]['id'], ingredient.id)
+        self.assertEqual(len(res.data['results']), 1)
+        self.assertEqual(res.data['results'][0]['name'], 'Kale')
+        self.assertEqual(res.data['results'][0]['id'], ingredient.id)
+
+    def test_create_ingredient(self):
+        """Test creating an ingredient."""
+        res = self.client.post(INGREDIENTS_URL, {'name': 'Kale'})
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(
+            Ingredient.objects.filter(user=self.user, name='Kale').exists()
+        )
+
+    def test_create_duplicate_ingredient_error(self):
+        """Test creating a duplicate ingredient returns an error."""
+        Ingredient.objects.create(user=self.user, name='Kale')
+
+        res = self.client.post(INGREDIENTS_URL, {'name': 'kale'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            Ingredient.objects.filter(user=self.user).count(),
+            1
+        )
+
+    def test_bulk_create_ingredients(self):
+        """Test bulk creating ingredients skips names that already exist."""
+        Ingredient.objects.create(user=self.user, name='Salt')
+
+        res = self.client.post(
+            reverse('recipe:ingredient-bulk'),
+            {'names': ['Salt', 'Pepper', 'Kale']},
+            format='json'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            Ingredient.objects.filter(user=self.user).count(),
+            3
+        )
 
     def test_update_ingredient(self):
         """Test updating an ingredient"""
@@ -135,8 +176,8 @@ class PrivateIngredientsAPITests(TestCase):
         res = self.client.get(INGREDIENTS_URL, {'assigned_only': 1})
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data), 2)
-        self.assertNotIn(ingredient3, res.data)
+        self.assertEqual(len(res.data['results']), 2)
+        self.assertNotIn(ingredient3, res.data['results'])
 
     def test_filtered_ingredients_unique(self):
         """Test that filtered ingredients are unique."""
@@ -161,4 +202,4 @@ class PrivateIngredientsAPITests(TestCase):
         res = self.client.get(INGREDIENTS_URL, {'assigned_only': 1})
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data), 1)
+        self.assertEqual(len(res.data['results']), 1)
@@ -2,6 +2,7 @@
 Tests for recipe APIs.
 """
 from decimal import Decimal
+from functools import lru_cache
 import os
 import tempfile
 
@@ -26,15 +27,19 @@ from recipe.serializers import (
     RecipeDetailSerializer
 )
 
+from recipe.tests.factories import bulk_create_recipes
+
 
 RECIPES_URL = reverse('recipe:recipe-list')
 
 
+@lru_cache(maxsize=None)
 def detail_url(recipe_id: int) -> str:
     """Return recipe detail URL."""
     return reverse('recipe:recipe-detail', args=[recipe_id])
 
 
+@lru_cache(maxsize=None)
 def image_upload_url(recipe_id: int) -> str:
     """Create and return an image upload URL."""
     return reverse('recipe:recipe-upload-image', args=[recipe_id])
@@ -73,12 +78,15 @@ class PrivateRecipeAPITests(TestCase):
     Test authenticated recipe APIs.
     """
 
-    def setUp(self) -> None:
-        self.client = APIClient()
-        self.user = get_user_model().objects.create_user(
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = get_user_model().objects.create_user(
             'user@example.com',
             'testpass123'
         )
+
+    def setUp(self) -> None:
+        self.client = APIClient()
         self.client.force_authenticate(self.user)
 
     def test_retrieve_recipes(self) -> None:
@@ -92,7 +100,7 @@ class PrivateRecipeAPITests(TestCase):
         serializer = RecipeSerializer(recipes, many=True)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, serializer.data)
+        self.assertEqual(response.data['results'], serializer.data)
 
     def test_recipe_list_limited_to_user(self) -> None:
         """Test list of recipes is limited to authenticated user."""
@@ -108,7 +116,91 @@ class PrivateRecipeAPITests(TestCase):
         recipes = Recipe.objects.filter(user=self.user)
         serializer = RecipeSerializer(recipes, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
+
+    def test_retrieve_recipes_query_count(self) -> None:
+        """Test listing recipes does not run one query per recipe."""
+        recipes = bulk_create_recipes(self.user, 3)
+        for i, recipe in enumerate(recipes):
+            recipe.tags.add(
+                Tag.objects.create(user=self.user, name=f'Tag {i}')
+            )
+            recipe.ingredients.add(
+                Ingredient.objects.create(
+                    user=self.user,
+                    name=f'Ingredient {i}'
+                )
+            )
+
+        with self.assertNumQueries(6):
+            res = self.client.get(RECIPES_URL)
+            # recipes + two prefetches + the three ETag aggregates
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 3)
+
+    def test_retrieve_recipes_paginated(self) -> None:
+        """Test the recipe list is cursor paginated."""
+        bulk_create_recipes(self.user, 25)
+
+        res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 20)
+        self.assertIsNotNone(res.data['next'])
+
+        res = self.client.get(res.data['next'])
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 5)
+
+    def test_retrieve_recipes_not_modified(self) -> None:
+        """Test listing recipes returns 304 when nothing changed."""
+        create_recipe(user=self.user)
+
+        first = self.client.get(RECIPES_URL)
+        res = self.client.get(RECIPES_URL, HTTP_IF_NONE_MATCH=first['ETag'])
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        create_recipe(user=self.user)
+        res = self.client.get(RECIPES_URL, HTTP_IF_NONE_MATCH=first['ETag'])
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_retrieve_recipes_modified_by_tag_rename(self) -> None:
+        """Test renaming a tag invalidates the recipe list ETag."""
+        recipe = create_recipe(user=self.user)
+        tag = Tag.objects.create(user=self.user, name='Vegan')
+        recipe.tags.add(tag)
+
+        first = self.client.get(RECIPES_URL)
+        tag.name = 'Vegetarian'
+        tag.save()
+
+        res = self.client.get(RECIPES_URL, HTTP_IF_NONE_MATCH=first['ETag'])
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data['results'][0]['tags'][0]['name'],
+            'Vegetarian',
+        )
+
+    def test_retrieve_recipes_modified_by_tag_delete(self) -> None:
+        """Test deleting a tag invalidates the recipe list ETag."""
+        recipe = create_recipe(user=self.user)
+        tag = Tag.objects.create(user=self.user, name='Vegan')
+        Tag.objects.create(user=self.user, name='Dessert')
+        # the later row keeps Max(updated_at) unchanged after the delete
+        recipe.tags.add(tag)
+
+        first = self.client.get(RECIPES_URL)
+        tag.delete()
+
+        res = self.client.get(RECIPES_URL, HTTP_IF_NONE_MATCH=first['ETag'])
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['results'][0]['tags'], [])
 
     def test_get_recipe_detail(self):
         """Test get recipe detail."""
@@ -361,9 +453,15 @@ class PrivateRecipeAPITests(TestCase):
         params = {'tags': f'{tag1.id},{tag2.id}'}
         res = self.client.get(RECIPES_URL, params)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertIn(serializer1.data, res.data)
-        self.assertIn(serializer2.data, res.data)
-        self.assertNotIn(serializer3.data, res.data)
+        self.assertIn(serializer1.data, res.data['results'])
+        self.assertIn(serializer2.data, res.data['results'])
+        self.assertNotIn(serializer3.data, res.data['results'])
+
+    def test_filter_by_invalid_ids_error(self):
+        """Test filtering with non-numeric IDs returns an error."""
+        res = self.client.get(RECIPES_URL, {'tags': 'one,2'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
 
     def test_filter_by_ingredients(self):
         """Test filtering recipes by ingredients."""
@@ -382,20 +480,23 @@ class PrivateRecipeAPITests(TestCase):
         params = {'ingredients': f'{ingredient1.id},{ingredient2.id}'}
         res = self.client.get(RECIPES_URL, params)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertIn(serializer1.data, res.data)
-        self.assertIn(serializer2.data, res.data)
-        self.assertNotIn(serializer3.data, res.data)
+        self.assertIn(serializer1.data, res.data['results'])
+        self.assertIn(serializer2.data, res.data['results'])
+        self.assertNotIn(serializer3.data, res.data['results'])
 
 
 class ImageUploadTests(TestCase):
     """Tests for the image upload API."""
 
-    def setUp(self):
-        self.client = APIClient()
-        self.user = get_user_model().objects.create_user(
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = get_user_model().objects.create_user(
             'user@example.com',
             'password123',
         )
+
+    def setUp(self):
+        self.client = APIClient()
         self.client.force_authenticate(self.user)
         self.recipe = create_recipe(user=self.user)
 
@@ -420,6 +521,13 @@ class ImageUploadTests(TestCase):
         self.assertIn('image', res.data)
         self.assertTrue(os.path.exists(self.recipe.image.path))
 
+    def test_upload_image_invalid_id(self):
+        """Test uploading to a malformed recipe id returns 404."""
+        url = image_upload_url(recipe_id='abc')
+        res = self.client.post(url, {}, format='multipart')
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
     def test_upload_image_failure(self):
         """Test uploading an invalid image."""
         url = image_upload_url(recipe_id=self.recipe.id)
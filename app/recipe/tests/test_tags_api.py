@@ -1,9 +1,12 @@
 """
 Tests for the Tags API
 """
+import json
 from decimal import Decimal
+from functools import lru_cache
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.urls import reverse
 from django.test import TestCase
 
@@ -22,6 +25,7 @@ from recipe.serializers import TagSerializer
 TAGS_URL = reverse('recipe:tag-list')
 
 
+@lru_cache(maxsize=None)
 def detail_url(tag_id) -> str:
     """Create and return a tag detail url."""
     return reverse('recipe:tag-detail', args=[tag_id])
@@ -47,15 +51,22 @@ class PublicTagsApiTests(TestCase):
 class PrivateTagsApiTests(TestCase):
     """Tests authenticated tag API requests"""
 
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = create_user()
+
     def setUp(self) -> None:
-        self.user = create_user()
+        cache.clear()
+        # the list cache outlives the per-test DB rollback
         self.client = APIClient()
         self.client.force_authenticate(self.user)
 
     def test_retrieve_tags(self):
         """Test retrieving a list of tags"""
-        Tag.objects.create(user=self.user, name='Vegan')
-        Tag.objects.create(user=self.user, name='Dessert')
+        Tag.objects.bulk_create([
+            Tag(user=self.user, name='Vegan'),
+            Tag(user=self.user, name='Dessert'),
+        ])
 
         res = self.client.get(TAGS_URL)
 
@@ -63,7 +74,7 @@ class PrivateTagsApiTests(TestCase):
         serializer = TagSerializer(tags, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_tags_limited_to_user(self):
         """Test list of tags is limited to authenticated user"""
@@ -74,9 +85,121 @@ class PrivateTagsApiTests(TestCase):
         res = self.client.get(TAGS_URL)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data), 1)
-        self.assertEqual(res.data[0]['name'], tag.name)
-        self.assertEqual(res.data[0]['id'], tag.id)
+        self.assertEqual(len(res.data['results']), 1)
+        self.assertEqual(res.data['results'][0]['name'], tag.name)
+        self.assertEqual(res.data['results'][0]['id'], tag.id)
+
+    def test_retrieve_tags_cached(self):
+        """Test a repeat tag listing is served from the cache."""
+        Tag.objects.create(user=self.user, name='Vegan')
+        self.client.get(TAGS_URL)
+
+        with self.assertNumQueries(1):
+            res = self.client.get(TAGS_URL)
+            # only the ETag aggregate runs; the payload comes from cache
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 1)
+
+        Tag.objects.create(user=self.user, name='Dessert')
+        res = self.client.get(TAGS_URL)
+
+        self.assertEqual(len(res.data['results']), 2)
+
+    def test_retrieve_tags_not_modified(self):
+        """Test listing tags returns 304 when nothing changed."""
+        Tag.objects.create(user=self.user, name='Vegan')
+
+        first = self.client.get(TAGS_URL)
+        res = self.client.get(TAGS_URL, HTTP_IF_NONE_MATCH=first['ETag'])
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Tag.objects.create(user=self.user, name='Dessert')
+        res = self.client.get(TAGS_URL, HTTP_IF_NONE_MATCH=first['ETag'])
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_retrieve_tags_not_modified_since(self):
+        """Test listing tags honours If-Modified-Since."""
+        Tag.objects.create(user=self.user, name='Vegan')
+
+        first = self.client.get(TAGS_URL)
+        res = self.client.get(
+            TAGS_URL,
+            HTTP_IF_MODIFIED_SINCE=first['Last-Modified']
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_create_tag(self):
+        """Test creating a tag."""
+        res = self.client.post(TAGS_URL, {'name': 'Vegan'})
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(
+            Tag.objects.filter(user=self.user, name='Vegan').exists()
+        )
+
+    def test_create_duplicate_tag_error(self):
+        """Test creating a duplicate tag returns an error."""
+        Tag.objects.create(user=self.user, name='Vegan')
+
+        res = self.client.post(TAGS_URL, {'name': 'vegan'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Tag.objects.filter(user=self.user).count(), 1)
+
+    def test_bulk_create_tags(self):
+        """Test bulk creating tags skips names that already exist."""
+        Tag.objects.create(user=self.user, name='Vegan')
+
+        res = self.client.post(
+            reverse('recipe:tag-bulk'),
+            {'names': ['Vegan', 'Dessert', 'Dinner']},
+            format='json'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Tag.objects.filter(user=self.user).count(), 3)
+
+    def test_bulk_create_tags_invalid_payload(self):
+        """Test bulk creating tags with a bad payload returns an error."""
+        res = self.client.post(
+            reverse('recipe:tag-bulk'),
+            {'names': 'Vegan'},
+            format='json'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_tags(self):
+        """Test exporting tags as newline-delimited JSON."""
+        Tag.objects.bulk_create([
+            Tag(user=self.user, name='Vegan'),
+            Tag(user=self.user, name='Dessert'),
+        ])
+
+        res = self.client.get(reverse('recipe:tag-export'))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(res.streaming_content).decode().splitlines()
+        self.assertEqual(
+            [json.loads(line)['name'] for line in lines],
+            ['Vegan', 'Dessert'],
+        )
+
+    def test_bulk_create_tags_name_too_long(self):
+        """Test bulk creating tags rejects over-long names."""
+        res = self.client.post(
+            reverse('recipe:tag-bulk'),
+            {'names': ['Vegan', 'x' * 256]},
+            format='json'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Tag.objects.filter(user=self.user).exists())
 
     def test_update_tag(self):
         """Test updating a tag."""
@@ -90,6 +213,17 @@ class PrivateTagsApiTests(TestCase):
         tag.refresh_from_db()
         self.assertEqual(tag.name, payload['name'])
 
+    def test_update_tag_unchanged_name_skips_write(self):
+        """Test updating a tag with its current name does not write."""
+        tag = Tag.objects.create(user=self.user, name='Vegan')
+        updated_at = tag.updated_at
+
+        res = self.client.patch(detail_url(tag.id), {'name': 'Vegan'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        tag.refresh_from_db()
+        self.assertEqual(tag.updated_at, updated_at)
+
     def test_delete_tag(self):
         """Test deleting a tag."""
         tag = Tag.objects.create(user=self.user, name='Vegan')
@@ -101,6 +235,12 @@ class PrivateTagsApiTests(TestCase):
         tags = Tag.objects.filter(user=self.user)
         self.assertFalse(tags.exists())
 
+    def test_delete_tag_invalid_id(self):
+        """Test deleting a tag with a malformed id returns 404."""
+        res = self.client.delete(detail_url('abc'))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
     def test_filter_tags_assigned_to_recipes(self):
         """Test listing tags by those assigned to recipes."""
         tag1 = Tag.objects.create(user=self.user, name='Apples')
@@ -118,8 +258,8 @@ class PrivateTagsApiTests(TestCase):
         res = self.client.get(TAGS_URL, {'assigned_only': 1})
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data), 2)
-        self.assertNotIn(tag3, res.data)
+        self.assertEqual(len(res.data['results']), 2)
+        self.assertNotIn(tag3, res.data['results'])
 
     def test_filtered_tags_unique(self):
         """Test that filtered tags are unique."""
@@ -144,4 +284,4 @@ class PrivateTagsApiTests(TestCase):
         res = self.client.get(TAGS_URL, {'assigned_only': 1})
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data), 1)
+        self.assertEqual(len(res.data['results']), 1)
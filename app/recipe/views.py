@@ -1,6 +1,8 @@
 """
 Views for Recipe APIs.
 """
+import json
+
 from drf_spectacular.utils import (
     extend_schema_view,
     extend_schema,
@@ -15,16 +17,109 @@ from rest_framework import (
 )
 from rest_framework.decorators import action
 from rest_framework.authentication import TokenAuthentication
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import HttpRequest
 from rest_framework.response import Response
 
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse, StreamingHttpResponse
+from django.db.models import Count, Exists, Max, OuterRef, Prefetch
+from django.utils.http import http_date, parse_http_date_safe
+
+from core.cache import (
+    LIST_CACHE_TIMEOUT,
+    attr_list_cache_key,
+    invalidate_attr_list_cache,
+)
 from core.models import (
     Recipe,
     Tag,
     Ingredient,
 )
 from recipe import serializers
+from recipe.pagination import (
+    RecipeAttrCursorPagination,
+    RecipeCursorPagination,
+)
+
+
+_TAG_EXISTS = b'{"message": "Tag already exists"}'
+_TAG_NAME_EXISTS = b'{"message": "Tag with the same name already exists"}'
+_TAG_DELETED = b'{"message": "Tag deleted successfully"}'
+_INGREDIENT_EXISTS = b'{"message": "Ingredient already exists"}'
+_INGREDIENT_NAME_EXISTS = (
+    b'{"message": "Ingredient with the same name already exists"}'
+)
+
+
+def _static_json(body: bytes, status_code: int) -> HttpResponse:
+    """Return a constant payload serialized once at import time.
+
+    Skips DRF content negotiation and rendering, which a fixed message
+    never needs.
+    """
+    return HttpResponse(
+        body,
+        status=status_code,
+        content_type='application/json',
+    )
+
+
+def _list_cache_headers(queryset, *related) -> tuple:
+    """Build ETag and Last-Modified values for a list queryset.
+
+    Extra querysets fold their Max(updated_at) in, for payloads that
+    embed rows from other tables (the recipe list nests tag and
+    ingredient names, so a rename there must change the ETag too).
+    """
+    agg = queryset.aggregate(
+        count=Count('id'),
+        last_modified=Max('updated_at'),
+    )
+    last_modified = agg['last_modified']
+    counts = [agg['count']]
+    for extra in related:
+        extra_agg = extra.aggregate(
+            count=Count('id'),
+            last_modified=Max('updated_at'),
+        )
+        counts.append(extra_agg['count'])
+        # deleting a row other than the newest leaves Max(updated_at)
+        # alone; the count catches it
+        other = extra_agg['last_modified']
+        if other and (last_modified is None or other > last_modified):
+            last_modified = other
+    timestamp = last_modified.isoformat() if last_modified else 'empty'
+    counts_part = '-'.join(str(count) for count in counts)
+    return f'"{counts_part}-{timestamp}"', last_modified
+
+
+def _not_modified(request: HttpRequest, etag: str, last_modified) -> bool:
+    """Check the request's conditional headers against current values."""
+    if request.headers.get('If-None-Match') == etag:
+        return True
+
+    since = parse_http_date_safe(
+        request.headers.get('If-Modified-Since', '')
+    )
+    return (
+        since is not None
+        and last_modified is not None
+        and int(last_modified.timestamp()) <= since
+    )
+
+
+class AuthedViewSetMixin:
+    """Token authentication shared by the recipe viewsets.
+
+    Tuples rather than lists: they are immutable and marginally cheaper
+    to iterate on every request.
+    """
+    authentication_classes = (TokenAuthentication,)
+    permission_classes = (IsAuthenticated,)
 
 
 @extend_schema_view(
@@ -43,58 +138,140 @@ from recipe import serializers
         ]
     )
 )
-class RecipeViewSet(viewsets.ModelViewSet):
+class RecipeViewSet(AuthedViewSetMixin, viewsets.ModelViewSet):
     """ViewSet for Recipe app."""
-    authentication_classes = [TokenAuthentication]
-    permission_classes = [IsAuthenticated]
     queryset = Recipe.objects.all()
     serializer_class = serializers.RecipeDetailSerializer
+    pagination_class = RecipeCursorPagination
+    action_serializers = {
+        'list': serializers.RecipeListSerializer,
+        'upload_image': serializers.RecipeImageSerializer,
+    }
 
     def _params_to_ints(self, qs: str) -> list[int]:
         """Convert a list of string IDs to a list of integers."""
-        return [int(str_id) for str_id in qs.split(',')]
+        cached = getattr(self.request, '_parsed_id_params', None)
+        if cached is None:
+            cached = self.request._parsed_id_params = {}
+            # get_queryset runs more than once per request; parse once
+        if qs not in cached:
+            str_ids = qs.split(',')
+            if not all(str_id.isdigit() for str_id in str_ids):
+                raise ValidationError(
+                    'ID filters must be comma separated integers.'
+                )
+            cached[qs] = list(map(int, str_ids))
+        return cached[qs]
 
     def get_queryset(self):
         """Return objects for the current authenticated user only."""
+        cached = getattr(self, '_cached_queryset', None)
+        if cached is not None:
+            return cached
+            # DRF calls get_queryset several times per request; build once
+
         tags = self.request.query_params.get('tags')
         ingredients = self.request.query_params.get('ingredients')
         queryset = self.queryset
 
         if tags:
             tag_ids = self._params_to_ints(tags)
-            queryset = queryset.filter(tags__id__in=tag_ids)
-            # syntax for filtering by foreign key
+            queryset = queryset.filter(Exists(
+                Recipe.tags.through.objects.filter(
+                    recipe_id=OuterRef('pk'),
+                    tag_id__in=tag_ids,
+                )
+            ))
+            # subquery instead of a join, so no duplicate rows to DISTINCT
 
         if ingredients:
             ingredient_ids = self._params_to_ints(ingredients)
-            queryset = queryset.filter(ingredients__id__in=ingredient_ids)
-            # syntax for filtering by foreign key
-
-        return queryset.filter(
+            queryset = queryset.filter(Exists(
+                Recipe.ingredients.through.objects.filter(
+                    recipe_id=OuterRef('pk'),
+                    ingredient_id__in=ingredient_ids,
+                )
+            ))
+            # subquery instead of a join, so no duplicate rows to DISTINCT
+
+        queryset = queryset.filter(
             user=self.request.user
-        ).order_by('-id').distinct()
+        ).order_by('-id')
+
+        if self.action in ('list', 'retrieve'):
+            queryset = queryset.prefetch_related(
+                Prefetch('tags', queryset=Tag.objects.only('id', 'name')),
+                Prefetch(
+                    'ingredients',
+                    queryset=Ingredient.objects.only('id', 'name')
+                ),
+            )
+            # avoids one query per recipe when serializing the relations,
+            # and only pulls the columns the nested serializers render
+
+        if self.action == 'list':
+            queryset = queryset.only(
+                'id',
+                'title',
+                'time_minutes',
+                'price',
+                'link',
+                'image',
+            )
+            # every RecipeSerializer column; leaves description unfetched
+
+        self._cached_queryset = queryset
+        return queryset
 
     def get_serializer_class(self):
         """Return appropriate serializer class."""
-        if self.action == 'list':
-            return serializers.RecipeSerializer
-        elif self.action == 'upload_image':
-            return serializers.RecipeImageSerializer
-        return self.serializer_class
+        return self.action_serializers.get(self.action, self.serializer_class)
+
+    def list(self, request: HttpRequest, *args, **kwargs):
+        """List recipes, answering 304 when the client copy is current."""
+        etag, last_modified = _list_cache_headers(
+            self.get_queryset(),
+            Tag.objects.filter(user=request.user),
+            Ingredient.objects.filter(user=request.user),
+        )
+        if _not_modified(request, etag, last_modified):
+            return Response(status=status.HTTP_304_NOT_MODIFIED)
 
+        response = super().list(request, *args, **kwargs)
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+        return response
+
+    @transaction.atomic
     def perform_create(self, serializer):
-        """Create a new recipe."""
+        """Create a new recipe and its tags/ingredients in one commit."""
         serializer.save(user=self.request.user)
 
+    @transaction.atomic
+    def perform_update(self, serializer):
+        """Update a recipe and its tags/ingredients in one commit."""
+        serializer.save()
+
     @action(methods=['POST'], detail=True, url_path='upload-image')
     def upload_image(self, request: HttpRequest, pk=None):
         """Upload an image to a recipe."""
-        recipe = self.get_object()
+        recipe = get_object_or_404(Recipe, pk=pk, user=request.user)
+        # one targeted query; get_object() would rebuild the filtered,
+        # ordered queryset just to fetch a single row by pk. The DRF
+        # helper also maps a malformed pk to 404, unlike the shortcut
         serializer = self.get_serializer(recipe, data=request.data)
 
         if serializer.is_valid():
             serializer.save()
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            return Response(
+                {
+                    'id': recipe.id,
+                    'image': recipe.image.url if recipe.image else None,
+                },
+                status=status.HTTP_200_OK
+            )
+            # plain dict; serializer.data would re-render every field
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -111,145 +288,209 @@ class RecipeViewSet(viewsets.ModelViewSet):
     )
 )
 class BaseRecipeAttrViewSet(
+    AuthedViewSetMixin,
     mixins.ListModelMixin,
     mixins.UpdateModelMixin,
     mixins.DestroyModelMixin,
     viewsets.GenericViewSet
 ):
-    """Base ViewSet for recipe attributes."""
-    authentication_classes = [TokenAuthentication]
-    permission_classes = [IsAuthenticated]
-
-    def get_queryset(self):
-        assigned_only: bool = bool(
+    """Base ViewSet for recipe attributes.
+
+    One shared create/update implementation keeps a single hot bytecode
+    path for both subclasses; only the duplicate-message bodies differ.
+    """
+    pagination_class = RecipeAttrCursorPagination
+    duplicate_body = None
+    duplicate_name_body = None
+
+    def _assigned_only(self) -> bool:
+        """Parse the assigned_only query parameter."""
+        return bool(
             int(self.request.query_params.get('assigned_only', 0))
         )
+
+    def get_queryset(self):
+        cached = getattr(self, '_cached_queryset', None)
+        if cached is not None:
+            return cached
+            # DRF calls get_queryset several times per request; build once
+
+        assigned_only = self._assigned_only()
         queryset = self.queryset
 
         if assigned_only:
-            queryset = queryset.filter(recipe__isnull=False)
-
-        return queryset.filter(
+            model = queryset.model
+            through = model._meta.get_field('recipe').through
+            queryset = queryset.filter(Exists(
+                through.objects.filter(
+                    **{f'{model._meta.model_name}_id': OuterRef('pk')}
+                )
+            ))
+            # subquery instead of a join, so no duplicate rows to DISTINCT
+
+        queryset = queryset.filter(
             user=self.request.user
-        ).order_by('-name').distinct()
-
-
-class TagViewSet(BaseRecipeAttrViewSet):
-    """ViewSet for tags."""
-    serializer_class = serializers.TagSerializer
-    queryset = Tag.objects.all()
-
-    def _instance_exists(
-        self,
-        request: HttpRequest,
-        serializer: serializers.TagSerializer
-    ) -> bool:
-        """Check if the instance exists."""
-        serializer.is_valid(raise_exception=True)
-        tag = serializer.validated_data
-        return Tag.objects.filter(
-            user=request.user,
-            name__iexact=tag['name']
-        ).exists()
+        ).order_by('-name')
+
+        if self.action in ('list', 'export'):
+            queryset = queryset.only('id', 'name')
+            # the list serializers render id/name; updates keep the full
+            # row so deferred-field saves cannot skip updated_at
+
+        self._cached_queryset = queryset
+        return queryset
+
+    def list(self, request: HttpRequest, *args, **kwargs):
+        """List objects, answering 304 when the client copy is current."""
+        etag, last_modified = _list_cache_headers(self.get_queryset())
+        if _not_modified(request, etag, last_modified):
+            return Response(status=status.HTTP_304_NOT_MODIFIED)
+
+        if 'cursor' in request.query_params:
+            response = super().list(request, *args, **kwargs)
+            # only the first page is cached; later pages are rare
+        else:
+            key = attr_list_cache_key(
+                self.queryset.model._meta.model_name,
+                request.user.id,
+                self._assigned_only(),
+            )
+            data = cache.get(key)
+            if data is None:
+                response = super().list(request, *args, **kwargs)
+                cache.set(key, response.data, LIST_CACHE_TIMEOUT)
+            else:
+                response = Response(data)
+                # signals invalidate the key when the user's rows change
+
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+        return response
 
     def create(self, request: HttpRequest, *args, **kwargs):
-        """Create a new tag."""
+        """Create a new object for the authenticated user."""
         serializer = self.get_serializer(data=request.data)
-        tag_exists = self._instance_exists(request, serializer)
-        if not tag_exists:
-            serializer.save(user=self.request.user)
-            return Response(
-                serializer.data,
-                status=status.HTTP_201_CREATED
+        serializer.is_valid(raise_exception=True)
+        try:
+            with transaction.atomic():
+                serializer.save(user=self.request.user)
+        except IntegrityError:
+            return _static_json(
+                self.duplicate_body,
+                status.HTTP_400_BAD_REQUEST,
             )
 
         return Response(
-            {'message': 'Tag already exists'},
-            status=status.HTTP_400_BAD_REQUEST
+            serializer.data,
+            status=status.HTTP_201_CREATED
         )
 
     def update(self, request: HttpRequest, *args, **kwargs):
-        """Update a new tag."""
+        """Update an object, translating a duplicate name to a 400."""
         instance = self.get_object()
         serializer = self.get_serializer(
             instance,
             data=request.data,
             partial=True
         )
-        tag_exists = self._instance_exists(request, serializer)
-        if not tag_exists:
-            serializer.save()
-            return Response(
-                serializer.data,
-                status=status.HTTP_200_OK
+        serializer.is_valid(raise_exception=True)
+        if serializer.validated_data.get('name') == instance.name:
+            return Response(serializer.data, status=status.HTTP_200_OK)
+            # nothing changed; skip the UPDATE round-trip
+
+        try:
+            with transaction.atomic():
+                serializer.save()
+        except IntegrityError:
+            return _static_json(
+                self.duplicate_name_body,
+                status.HTTP_400_BAD_REQUEST,
             )
 
         return Response(
-            {'message': 'Tag with the same name already exists'},
-            status=status.HTTP_400_BAD_REQUEST
+            serializer.data,
+            status=status.HTTP_200_OK
         )
 
-    def destroy(self, request, *args, **kwargs):
-        """Delete a tag."""
-        instance: Tag = self.get_object()
-        instance.delete()
-        return Response(
-            {'message': 'Tag deleted successfully'},
-            status=status.HTTP_204_NO_CONTENT
+    @action(methods=['GET'], detail=False, url_path='export')
+    def export(self, request: HttpRequest):
+        """Stream every object as newline-delimited JSON."""
+        rows = self.get_queryset().iterator(chunk_size=2000)
+        # server-side cursor; memory stays flat however large the list
+
+        return StreamingHttpResponse(
+            (
+                json.dumps({'id': obj.id, 'name': obj.name}) + '\n'
+                for obj in rows
+            ),
+            content_type='application/x-ndjson',
         )
 
+    @action(methods=['POST'], detail=False, url_path='bulk')
+    def bulk(self, request: HttpRequest):
+        """Create many objects at once, skipping names that exist."""
+        model = self.queryset.model
+        max_length = model._meta.get_field('name').max_length
+        names = request.data.get('names')
+        if (
+            not isinstance(names, list)
+            or not names
+            or not all(
+                isinstance(n, str) and n.strip() and len(n) <= max_length
+                for n in names
+            )
+        ):
+            raise ValidationError(
+                'names must be a list of non-empty strings of at most '
+                f'{max_length} characters.'
+            )
+            # mirrors the serializer's max_length check; without it an
+            # over-long name reaches Postgres and raises DataError (500)
 
-class IngredientViewSet(BaseRecipeAttrViewSet):
-    """ViewSet for ingredients"""
-    serializer_class = serializers.IngredientSerializer
-    queryset = Ingredient.objects.all()
+        model.objects.bulk_create(
+            [model(user=request.user, name=name) for name in names],
+            ignore_conflicts=True,
+            batch_size=500,
+        )
+        # one INSERT; the unique (user_id, LOWER(name)) index dedupes
 
-    def _instance_exists(
-        self,
-        request: HttpRequest,
-        serializer: serializers.IngredientSerializer
-    ) -> bool:
-        """Check if the instance exists."""
-        serializer.is_valid(raise_exception=True)
-        tag = serializer.validated_data
-        return Ingredient.objects.filter(
-            user=request.user,
-            name__iexact=tag['name']
-        ).exists()
+        invalidate_attr_list_cache(model._meta.model_name, request.user.id)
+        # bulk_create skips post_save signals, so invalidate here
 
-    def create(self, request: HttpRequest, *args, **kwargs):
-        """Create a new ingredient."""
-        serializer = self.get_serializer(data=request.data)
-        ingredient_exists = self._instance_exists(request, serializer)
-        if not ingredient_exists:
-            serializer.save(user=self.request.user)
-            return Response(
-                serializer.data,
-                status=status.HTTP_201_CREATED
-            )
+        created = model.objects.filter(user=request.user, name__in=names)
+        serializer = self.get_serializer(created, many=True)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
 
-        return Response(
-            {'message': 'Ingredient already exists'},
-            status=status.HTTP_400_BAD_REQUEST
-        )
 
-    def update(self, request: HttpRequest, *args, **kwargs):
-        """Update a new ingredient."""
-        instance = self.get_object()
-        serializer = self.get_serializer(
-            instance,
-            data=request.data,
-            partial=True
-        )
-        ingredient_exists = self._instance_exists(request, serializer)
-        if not ingredient_exists:
-            serializer.save()
-            return Response(
-                serializer.data,
-                status=status.HTTP_200_OK
-            )
+class TagViewSet(BaseRecipeAttrViewSet):
+    """ViewSet for tags."""
+    serializer_class = serializers.TagSerializer
+    queryset = Tag.objects.all()
+    duplicate_body = _TAG_EXISTS
+    duplicate_name_body = _TAG_NAME_EXISTS
 
-        return Response(
-            {'message': 'Ingredient with the same name already exists'},
-            status=status.HTTP_400_BAD_REQUEST
-        )
+    def destroy(self, request, *args, **kwargs):
+        """Delete a tag."""
+        try:
+            deleted, _ = Tag.objects.filter(
+                pk=kwargs['pk'],
+                user=request.user
+            ).delete()
+            # one DELETE statement instead of a SELECT then a DELETE
+        except ValueError:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+            # non-numeric pk; DRF's get_object() would also answer 404
+
+        if not deleted:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+
+        return _static_json(_TAG_DELETED, status.HTTP_204_NO_CONTENT)
+
+
+class IngredientViewSet(BaseRecipeAttrViewSet):
+    """ViewSet for ingredients"""
+    serializer_class = serializers.IngredientSerializer
+    queryset = Ingredient.objects.all()
+    duplicate_body = _INGREDIENT_EXISTS
+    duplicate_name_body = _INGREDIENT_NAME_EXISTS